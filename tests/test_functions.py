@@ -0,0 +1,122 @@
+import sys
+from importlib.util import find_spec
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from utils import functions  # noqa: E402
+
+requires_numba = pytest.mark.skipif(find_spec("numba") is None, reason="numba is not installed")
+
+
+@pytest.fixture(scope="module")
+def df_slice():
+    """
+    Ten days of the deduplicated DataFrame, with NaN values and missing hours
+    injected where the numba kernels have to follow the pandas NaN semantics.
+    """
+
+    df = functions._load_deduplicated()
+    df = df[df["timestamp"] < df["timestamp"].iloc[0].floor("D") + pd.Timedelta(days=10)].copy()
+    ts = df["timestamp"]
+    start = ts.iloc[0].floor("D")
+
+    # a whole day of missing hours and a few hours missing inside another day
+    gap = ((ts >= start + pd.Timedelta(days=3)) & (ts < start + pd.Timedelta(days=4))) \
+        | ((ts >= start + pd.Timedelta(days=6, hours=5)) & (ts < start + pd.Timedelta(days=6, hours=9)))
+    df = df[~gap].reset_index(drop=True)
+    ts = df["timestamp"]
+
+    # leading NaN values (nothing to interpolate from)
+    df.loc[ts < start + pd.Timedelta(hours=7), "coal"] = np.nan
+    # trailing NaN values (filled with the last value)
+    df.loc[ts >= start + pd.Timedelta(days=9, hours=15), "wind"] = np.nan
+    # a few NaN values inside an hour, the hour mean only counts the other values
+    df.loc[df.index[100:104], "nuclear"] = np.nan
+    # a whole hour of NaN in one column only
+    df.loc[(ts >= start + pd.Timedelta(days=5, hours=2)) & (ts < start + pd.Timedelta(days=5, hours=3)), "hydro"] = np.nan
+    return df
+
+
+@requires_numba
+def test_hour_numba_matches_pandas(df_slice, monkeypatch):
+    monkeypatch.setattr(functions, "USE_NUMBA", True)
+    df_numba = functions._run_hour(df_slice.copy())
+    monkeypatch.setattr(functions, "USE_NUMBA", False)
+    df_pandas = functions._run_hour(df_slice.copy())
+    pd.testing.assert_frame_equal(df_numba, df_pandas, check_freq=False, rtol=1e-6)
+
+
+@requires_numba
+@pytest.mark.parametrize("floor", [
+    lambda ts: functions._floor_timestamps(ts, functions.NS_PER_HOUR),
+    lambda ts: functions._floor_timestamps(ts, functions.NS_PER_DAY),
+    lambda ts: np.asarray(ts, dtype="datetime64[ns]").astype("datetime64[M]"),
+], ids=["hour", "day", "month"])
+def test_mean_by_key_numba_matches_pandas(df_slice, floor, monkeypatch):
+    key = floor(df_slice["timestamp"])
+    monkeypatch.setattr(functions, "USE_NUMBA", True)
+    df_numba = functions._mean_by_key(df_slice, key)
+    monkeypatch.setattr(functions, "USE_NUMBA", False)
+    df_pandas = functions._mean_by_key(df_slice, key)
+    pd.testing.assert_frame_equal(df_numba, df_pandas, rtol=1e-6)
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".parquet"])
+def test_save_path_keeps_the_time_section(tmp_path, suffix):
+    save_path = tmp_path / f"saved{suffix}"
+    df_month = functions.generate_df_by_time_section("month", save_path=save_path)
+    df_year = functions.generate_df_by_time_section("year", save_path=save_path)
+    assert len(df_year) < len(df_month)
+    # the saved year section is loaded instead of being computed again
+    pd.testing.assert_frame_equal(functions.generate_df_by_time_section("year", save_path=save_path), df_year)
+
+
+@pytest.mark.parametrize("run", [functions._run_day, functions._run_month, functions._run_year],
+                         ids=["day", "month", "year"])
+def test_sections_are_chronological_on_unsorted_rows(run):
+    df = functions._load_deduplicated()
+    df_sorted = run(df.copy())
+    df_shuffled = run(df.sample(frac=1, random_state=0).reset_index(drop=True))
+    assert df_shuffled["timestamp"].is_monotonic_increasing
+    pd.testing.assert_frame_equal(df_shuffled, df_sorted, rtol=1e-6)
+
+
+def test_week_year_boundary_days_are_in_iso_week():
+    df = functions._load_deduplicated()
+    df_week = functions._run_week(df.copy())
+    # 2016-01-01 .. 2016-01-03 belong to the ISO week (2015, 53), with no separate (2016, 53) row
+    assert df_week[(df_week["year"] == 2016) & (df_week["week"] == 53)].empty
+    week = df_week[(df_week["year"] == 2015) & (df_week["week"] == 53)]
+    assert week["timestamp"].tolist() == [pd.Timestamp("2015-12-28")]
+    # the week values are the mean of its 7 daily values, times 7
+    df_day = functions._run_day(df.copy())
+    days = df_day[(df_day["timestamp"] >= "2015-12-28") & (df_day["timestamp"] <= "2016-01-03")]
+    assert len(days) == 7
+    np.testing.assert_allclose(week[functions.ENERGY_COLS].to_numpy()[0],
+                               days[functions.ENERGY_COLS].mean().to_numpy() * 7, rtol=1e-5)
+
+
+def test_timestamps_are_ns_without_pyarrow(tmp_path, monkeypatch):
+    monkeypatch.setattr(functions, "pa", None)
+    monkeypatch.setattr(functions, "PATH_ORIGINAL_PARQUET", tmp_path / "original.parquet")
+    functions._load_original.cache_clear()
+    try:
+        assert functions._load_original()["timestamp"].dtype == "datetime64[ns]"
+    finally:
+        functions._load_original.cache_clear()
+    save_path = tmp_path / "saved.csv"
+    functions.generate_df_by_time_section("year", save_path=save_path)
+    assert functions.generate_df_by_time_section("year", save_path=save_path)["timestamp"].dtype == "datetime64[ns]"
+
+
+def test_saved_csv_layout(tmp_path):
+    save_path = tmp_path / "saved.csv"
+    functions.generate_df_by_time_section("original", save_path=save_path)
+    with open(save_path) as file:
+        header, first_row = file.readline(), file.readline()
+    assert header == "timestamp,coal,nuclear,wind,hydro,solar\n"
+    assert first_row.startswith("2012-01-01 00:00:01,")
@@ -0,0 +1,84 @@
+# numba kernels of utils/functions.py, only imported when functions.USE_NUMBA is set
+# (importing numba takes longer than computing most time sections with pandas)
+import numpy as np
+from numba import njit, prange
+
+
+@njit(parallel=True, cache=True)
+def hourly_kernel(ts_hour, values):
+    """
+    All the hourly pipeline in one pass over the data.
+
+    - ts_hour: np.ndarray[int64] of shape (n,)
+        the timestamps as hours since the epoch.
+    - values: np.ndarray[float32] of shape (n, n_cols)
+        the energy values.
+
+    Returns the first hour of the result (hours since the epoch) and
+    a float32 array with one row for every hour of every recording day:
+    the mean values of the hour, the missing hours filled by linear
+    interpolation, multiplied by 12.
+    """
+    first_hour = (ts_hour.min() // 24) * 24
+    n_hours = (ts_hour.max() // 24) * 24 + 24 - first_hour
+    n_cols = values.shape[1]
+
+    # sum and count the values of every hour (NaN values are skipped, like pandas mean)
+    sums = np.zeros((n_hours, n_cols))
+    counts = np.zeros((n_hours, n_cols), dtype=np.int64)
+    for i in range(ts_hour.shape[0]):
+        h = ts_hour[i] - first_hour
+        for c in range(n_cols):
+            if not np.isnan(values[i, c]):
+                sums[h, c] += values[i, c]
+                counts[h, c] += 1
+
+    out = np.empty((n_hours, n_cols), dtype=np.float32)
+    for c in prange(n_cols):
+        prev = -1
+        for h in range(n_hours):
+            if counts[h, c] == 0:
+                continue
+            mean = sums[h, c] / counts[h, c]
+            if prev == -1:
+                # no value before the first recorded hour, like pandas interpolate
+                for k in range(h):
+                    out[k, c] = np.nan
+            else:
+                # linear interpolation of the missing hours between prev and h
+                prev_mean = sums[prev, c] / counts[prev, c]
+                for k in range(prev + 1, h):
+                    out[k, c] = (prev_mean + (mean - prev_mean) * (k - prev) / (h - prev)) * 12
+            out[h, c] = mean * 12
+            prev = h
+        # the missing hours after the last recorded hour take its value, like pandas interpolate
+        for k in range(prev + 1, n_hours):
+            out[k, c] = out[prev, c] if prev != -1 else np.nan
+
+    return first_hour, out
+
+@njit(parallel=True, cache=True)
+def group_mean_kernel(starts, values):
+    """
+    Mean of the values for every group of consecutive rows.
+
+    - starts: np.ndarray[int64] of shape (n_groups + 1,)
+        the index of the first row of every group, then the number of rows.
+    - values: np.ndarray[float32] of shape (n, n_cols)
+        the energy values.
+
+    Returns a float32 array of shape (n_groups, n_cols), the columns are
+    reduced in parallel (NaN values are skipped, like pandas mean).
+    """
+    n_groups = starts.shape[0] - 1
+    out = np.empty((n_groups, values.shape[1]), dtype=np.float32)
+    for c in prange(values.shape[1]):
+        for g in range(n_groups):
+            total = 0.0
+            count = 0
+            for i in range(starts[g], starts[g + 1]):
+                if not np.isnan(values[i, c]):
+                    total += values[i, c]
+                    count += 1
+            out[g, c] = total / count if count > 0 else np.nan
+    return out
@@ -1,9 +1,447 @@
+import os
+import tempfile
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from datetime import datetime
-from tqdm.auto import tqdm
-tqdm.pandas()
+from functools import lru_cache
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    # pyarrow is optional, without it the csv is parsed with pandas
+    pa = None
+
+PATH_ORIGINAL_CSV = Path(__file__).resolve().parent.parent / "data" / "energy_use_in_the_UK_original.csv"
+PATH_ORIGINAL_PARQUET = PATH_ORIGINAL_CSV.with_suffix(".parquet")
+PATH_DEDUPLICATED_PARQUET = PATH_ORIGINAL_CSV.with_name("energy_use_in_the_UK_deduplicated.parquet")
+# the energy columns of the original csv, the only columns with the timestamp
+# that are read and the ones every time section aggregates
+ENERGY_COLS = ["coal", "nuclear", "wind", "hydro", "solar"]
+# float32 is precise enough for the energy values and halves the memory
+# moved by every groupby / interpolate / multiplication
+ENERGY_DTYPES = {col: "float32" for col in ENERGY_COLS}
+# every time section returns its timestamps with ns resolution, whatever parsed them
+TIMESTAMP_DTYPE = {"timestamp": "datetime64[ns]"}
+# dtypes of the csv files written by generate_df_by_time_section
+SAVED_DTYPES = {**ENERGY_DTYPES, "year": "int32", "week": "int16"}
+# set to True to run the hourly pipeline and the groupby means with the numba kernels
+# (if numba is installed), only faster once compiled: on the first call of a process
+# importing numba and starting its parallel runtime take longer than pandas
+USE_NUMBA = False
+NS_PER_HOUR = 3_600_000_000_000
+NS_PER_DAY = 24 * NS_PER_HOUR
+
+
+def _is_up_to_date(path, *sources):
+    """
+    True if the file at path exists and is more recent than all the sources.
+    """
+
+    path = Path(path)
+    return path.exists() and path.stat().st_mtime >= max(Path(source).stat().st_mtime for source in sources)
+
+
+def _read_parquet_cache(path):
+    """
+    Read a parquet cache written by _write_parquet_cache,
+    returns None if it cannot be read (e.g. truncated or no parquet engine).
+    """
+
+    try:
+        return pd.read_parquet(path)
+    except (ImportError, OSError, ValueError):
+        # pyarrow errors on a corrupted file (ArrowInvalid) are ValueError
+        return None
+
+
+def _write_parquet_cache(df, path, **kwargs):
+    """
+    Write df as a parquet cache at path, through a temp file in the same
+    directory replacing path once complete, so an interrupted write or
+    a concurrent process never leaves a truncated cache behind.
+    Nothing is written if there is no parquet engine or the directory
+    is not writable, only the in-process cache is used then.
+    """
+
+    path = Path(path)
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        os.close(fd)
+        df.to_parquet(tmp_path, **kwargs)
+        # mkstemp creates the file readable by its owner only,
+        # give it the mode a plain write would have (0o666 without the umask)
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, path)
+    except (ImportError, OSError):
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+@lru_cache(maxsize=1)
+def _load_original():
+    """
+    Parse the original csv once per process and keep a parquet copy
+    of it next to the csv, so next processes skip the csv parsing.
+    The parquet copy is rebuilt if the csv is more recent or it cannot be read.
+    Do not mutate the returned DataFrame, use a copy.
+    """
+
+    if _is_up_to_date(PATH_ORIGINAL_PARQUET, PATH_ORIGINAL_CSV):
+        df_original = _read_parquet_cache(PATH_ORIGINAL_PARQUET)
+        if df_original is not None:
+            # astype in case the parquet copy was written with other dtypes
+            return df_original.astype({**TIMESTAMP_DTYPE, **ENERGY_DTYPES})
+
+    # path = 'https://drive.google.com/uc?export=download&id=14rWJ6OKc_aZbAcb6h220vQP0xfitLgHM'
+    # df_original = pd.read_csv(path, sep=";", parse_dates=[" timestamp"])
+    if pa is not None:
+        # multi-threaded parsing straight into typed columns
+        column_types = {"timestamp": pa.timestamp("ns")}
+        column_types.update({col: pa.from_numpy_dtype(np.dtype(dtype)) for col, dtype in ENERGY_DTYPES.items()})
+        table = pa_csv.read_csv(
+            PATH_ORIGINAL_CSV,
+            read_options=pa_csv.ReadOptions(block_size=4 << 20),
+            convert_options=pa_csv.ConvertOptions(column_types=column_types, include_columns=list(column_types)),
+        )
+        df_original = table.to_pandas(self_destruct=True)
+    else:
+        # astype as pandas >= 2 may parse the timestamps with another resolution than ns
+        df_original = pd.read_csv(PATH_ORIGINAL_CSV, usecols=["timestamp", *ENERGY_COLS],
+                                  parse_dates=["timestamp"], dtype=ENERGY_DTYPES).astype(TIMESTAMP_DTYPE)
+    _write_parquet_cache(df_original, PATH_ORIGINAL_PARQUET)
+    return df_original
+
+
+def _fix_solar_outliers(df_original, verbose=False):
+    """
+    Replace the outliers in "solar" values with interpolation.
+    """
+
+    print("replace outliers in 'solar' values with interpolation ...") if verbose else ...
+    df_original.loc[576229:576230, "solar"] = [np.nan, np.nan]
+    df_original.loc[:, "solar"] = df_original.loc[:, "solar"].interpolate(method="linear", axis="index")
+    return df_original
+
+
+@lru_cache(maxsize=1)
+def _load_deduplicated():
+    """
+    The original DataFrame with the solar outliers fixed and the
+    duplicates dropped, which every time section is computed from.
+    Computed once per process and kept in a parquet file next to the
+    csv, rebuilt if the csv or this module is more recent or it cannot be read.
+    Do not mutate the returned DataFrame, use a copy.
+    """
+
+    if _is_up_to_date(PATH_DEDUPLICATED_PARQUET, PATH_ORIGINAL_CSV, __file__):
+        df_result = _read_parquet_cache(PATH_DEDUPLICATED_PARQUET)
+        if df_result is not None:
+            return df_result
+
+    df_result = _fix_solar_outliers(_load_original().copy())
+
+    # drop duplicates
+    # (only the rows sharing their timestamp with another row can be duplicates,
+    # so only those are compared on all the columns)
+    shared_timestamp = df_result["timestamp"].duplicated(keep=False).to_numpy()
+    duplicated = np.zeros(len(df_result), dtype=bool)
+    duplicated[shared_timestamp] = df_result[shared_timestamp].duplicated().to_numpy()
+    df_result = df_result[~duplicated].reset_index(drop=True)
+    _write_parquet_cache(df_result, PATH_DEDUPLICATED_PARQUET, compression="zstd")
+    return df_result
+
+
+def _numba_kernels():
+    """
+    The module of the numba kernels if USE_NUMBA is set and numba is installed, else None.
+    """
+
+    if not USE_NUMBA:
+        return None
+    try:
+        from . import _numba_kernels as kernels
+    except ImportError:
+        # numba is not installed
+        return None
+    return kernels
+
+
+def _timestamps_ns(timestamps):
+    """
+    The timestamps as an int64 ndarray of nanoseconds since the epoch.
+    """
+
+    return np.asarray(timestamps, dtype="datetime64[ns]").view(np.int64)
+
+
+def _floor_timestamps(timestamps, ns_per_unit):
+    """
+    Floor the timestamps to a multiple of ns_per_unit nanoseconds
+    (e.g. NS_PER_DAY to set the seconds, minutes and hours to 0)
+    with an integer division, returns a datetime64[ns] ndarray.
+    """
+
+    ns = _timestamps_ns(timestamps)
+    return ((ns // ns_per_unit) * ns_per_unit).view("datetime64[ns]")
+
+
+def _scale_energy(df_result, factor):
+    """
+    Multiply the energy columns of df_result by factor.
+    The energy columns are rebuilt from one contiguous 2D float32 array,
+    so pandas keeps them in a single block for the next operations.
+    """
+
+    values = df_result[ENERGY_COLS].to_numpy(dtype=np.float32, copy=True)
+    np.multiply(values, np.float32(factor), out=values)
+    df_energy = pd.DataFrame(values, columns=ENERGY_COLS, index=df_result.index)
+    return pd.concat([df_result.drop(columns=ENERGY_COLS), df_energy], axis=1)
+
+
+def _mean_by_key(df_result, key):
+    """
+    Mean of the energy columns of df_result for every value of key
+    (a datetime64[ns] ndarray with one value per row, e.g. the floored timestamps).
+    Returns a DataFrame with the keys in the column "timestamp" and the means.
+    """
+
+    key = np.asarray(key, dtype="datetime64[ns]")
+    kernels = _numba_kernels()
+    if kernels is not None and np.all(key[1:] >= key[:-1]):
+        # the keys are sorted (like the timestamps of the original DataFrame),
+        # so every group is a run of consecutive rows
+        starts = np.flatnonzero(key[1:] != key[:-1]) + 1
+        starts = np.concatenate(([0], starts, [len(key)]))
+        values = kernels.group_mean_kernel(starts, df_result[ENERGY_COLS].to_numpy(dtype=np.float32))
+        df_mean = pd.DataFrame(values, columns=ENERGY_COLS)
+        df_mean.insert(0, "timestamp", key[starts[:-1]])
+    else:
+        # sorted by key, like the groups of the numba kernel
+        df_mean = df_result[ENERGY_COLS].groupby(key).mean()
+        df_mean = df_mean.rename_axis("timestamp").reset_index()
+    return df_mean
+
+
+def _run_hour_numba(df_result, verbose=False):
+    """
+    Mean values for every hour, with the missing hours filled,
+    computed in one pass by the numba hourly_kernel.
+    """
+
+    # get the mean values for every hour, fill the missing hours
+    # with linear interpolation and multiply by 12 in one pass
+    print("get the mean values for every hour, fill the missing hours and multiply by 12 ...") if verbose else ...
+    ts_hour = _timestamps_ns(df_result["timestamp"]) // NS_PER_HOUR
+    values = df_result[ENERGY_COLS].to_numpy(dtype=np.float32)
+    first_hour, values = _numba_kernels().hourly_kernel(ts_hour, values)
+    df_result = pd.DataFrame(values, columns=ENERGY_COLS)
+    df_result.insert(0, "timestamp", ((first_hour + np.arange(len(df_result))) * NS_PER_HOUR).view("datetime64[ns]"))
+
+    return df_result
+
+
+def _run_hour(df_result, verbose=False):
+    """
+    Mean values for every hour, with the missing hours filled.
+    """
+
+    if _numba_kernels() is not None:
+        return _run_hour_numba(df_result, verbose=verbose)
+
+    # get the mean values for every hour
+    # (the hours without any recording are null values)
+    print("get the mean values for every hour ...") if verbose else ...
+    df_result = df_result.set_index("timestamp").resample("h").mean()
+
+    # add null values to fill the missing hours before the first and after the last recording hour
+    # (reindex on every hour of every recording day,
+    # no recording day is missing from the first to the last one)
+    print("add the missing hours to df_result ...") if verbose else ...
+    full_idx = pd.date_range(df_result.index.min().floor("D"),
+                             df_result.index.max().floor("D") + pd.Timedelta(hours=23),
+                             freq="h")
+    df_result = df_result.reindex(full_idx)
+
+    # interpolation on the energy columns to fill
+    # the null values of the missing hours
+    # (done while the timestamps are still the index, so only the energy columns are interpolated)
+    print("linear interpolation to fill the missing values ...") if verbose else ...
+    df_result = df_result.interpolate(method="linear", axis="index").rename_axis("timestamp").reset_index()
+
+    # multiply by 12 to get the actual values by hour
+    # (the original values were for every 5 minutes)
+    print("multiply all values by 12 to get the actual values by hour ...") if verbose else ...
+    df_result = _scale_energy(df_result, 12)
+
+    return df_result
+
+
+def _run_day(df_result, verbose=False):
+    """
+    Mean values for every day.
+    """
+
+    # get the mean values of every day
+    # (grouped by the timestamps with seconds, minutes and hours set to 0)
+    print("get the mean values for every day ...") if verbose else ...
+    df_result = _mean_by_key(df_result, _floor_timestamps(df_result["timestamp"], NS_PER_DAY))
+
+    # multiply by 12 * 24 to get the actual values by day
+    print("multiply all values by 12 * 24 to get the actual values by day ...") if verbose else ...
+    df_result = _scale_energy(df_result, 12 * 24)
+
+    return df_result
+
+
+def _run_week(df_result, verbose=False):
+    """
+    Mean values for every week.
+    """
+
+    # get the mean of every hours for every days
+    # (grouped by the timestamps with seconds, minutes and hours set to 0)
+    print("get the mean of every hours for every days ...") if verbose else ...
+    df_result = _mean_by_key(df_result, _floor_timestamps(df_result["timestamp"], NS_PER_DAY))
+
+    # add the columns "week" and "year"
+    # (the ISO calendar year the week belongs to, e.g. the days of
+    # january in the 52nd / 53rd week belong to the previous year)
+    print("add the columns week and year ...") if verbose else ...
+    iso = df_result["timestamp"].dt.isocalendar()
+    df_result["week"] = iso["week"].astype("int16")
+    df_result["year"] = iso["year"].astype("int32")
+
+    # get the mean of every day for every week
+    # and retrieve the timestamps for the mondays of every week
+    # (one groupby for both, so the timestamps stay aligned with their week)
+    print("get the mean of every day and the timestamp of the first day for every week ...") if verbose else ...
+    df_result = df_result.groupby(by=["year", "week"], as_index=False).agg(
+        timestamp=("timestamp", "min"),
+        **{col: (col, "mean") for col in ENERGY_COLS}
+    )
+
+    # reorganise the columns
+    df_result = df_result[["timestamp", "year", "week", *ENERGY_COLS]]
+
+    # multiply by 12 * 24 * 7 to get the actual values by week
+    print("multiply all values by 12 * 24 * 7 to get the actual values by week ...") if verbose else ...
+    df_result = _scale_energy(df_result, 12 * 24 * 7)
+
+    return df_result
+
+
+def _run_month(df_result, verbose=False):
+    """
+    Mean values per day for every month.
+    """
+
+    # get the mean of every hours for every months
+    # (grouped by the timestamps set to the start of their month)
+    print("get the mean of every hour for every month ...") if verbose else ...
+    month_key = np.asarray(df_result["timestamp"], dtype="datetime64[ns]").astype("datetime64[M]")
+    df_result = _mean_by_key(df_result, month_key)
+
+    # multiply by 12 * 24 to get the actual values by day
+    print("multiply all values by 12 * 24 to get the actual values by day ...") if verbose else ...
+    df_result = _scale_energy(df_result, 12 * 24)
+
+    print("/!\\ THE DATAFRAME CONTAINS THE MEAN VALUES PER DAY IN THE MONTH /!\\")
+
+    return df_result
+
+
+def _run_year(df_result, verbose=False):
+    """
+    Mean values per day for every year.
+    """
+
+    # get the mean of every hours for every years
+    # (grouped by the timestamps set to the start of their year)
+    print("get the mean of every hour for every year ...") if verbose else ...
+    year_key = np.asarray(df_result["timestamp"], dtype="datetime64[ns]").astype("datetime64[Y]")
+    df_result = _mean_by_key(df_result, year_key)
+
+    # multiply by 12 * 24 to get the actual values by day
+    print("multiply all values by 12 * 24 to get the actual values by day ...") if verbose else ...
+    df_result = _scale_energy(df_result, 12 * 24)
+
+    print("/!\\ THE DATAFRAME CONTAINS THE MEAN VALUES PER DAY IN THE YEAR /!\\")
+
+    return df_result
+
+
+def _section_path(save_path):
+    """
+    The file next to save_path recording the time section saved in it.
+    """
+
+    save_path = Path(save_path)
+    return save_path.with_name(save_path.name + ".section")
+
+
+def _save(df_result, save_path, time_section):
+    """
+    Save df_result to save_path, as parquet if its suffix is ".parquet", else as csv,
+    and record time_section in the file given by _section_path.
+    """
+
+    # remove the previous record first, so a failed save is never taken for an up to date one
+    _section_path(save_path).unlink(missing_ok=True)
+    if Path(save_path).suffix == ".parquet":
+        df_result.to_parquet(save_path, compression="zstd", index=False)
+    elif pa is not None:
+        # multi-threaded csv writer
+        table = pa.Table.from_pandas(df_result, preserve_index=False)
+        # the timestamps have a second resolution, cast them so they are written
+        # "YYYY-mm-dd HH:MM:SS" instead of with a nanosecond suffix
+        # (the safe cast raises if it would drop a fraction of second)
+        i_timestamp = table.schema.get_field_index("timestamp")
+        table = table.set_column(i_timestamp, "timestamp", table["timestamp"].cast(pa.timestamp("s")))
+        try:
+            # header without quotes, like to_csv
+            write_options = pa_csv.WriteOptions(quoting_header="none")
+        except TypeError:
+            # quoting_header is not available with older pyarrow versions
+            write_options = pa_csv.WriteOptions()
+        pa_csv.write_csv(table, save_path, write_options=write_options)
+    else:
+        df_result.to_csv(path_or_buf=save_path, index=False)
+    _section_path(save_path).write_text(time_section)
+
+
+def _is_saved(save_path, time_section):
+    """
+    True if save_path holds time_section, saved by _save after the last
+    change of the original csv and this module.
+    """
+
+    section_path = _section_path(save_path)
+    return (Path(save_path).exists()
+            and _is_up_to_date(section_path, save_path, PATH_ORIGINAL_CSV, __file__)
+            and section_path.read_text() == time_section)
+
+
+def _load_saved(save_path):
+    """
+    Load a DataFrame saved by _save.
+    """
+
+    if Path(save_path).suffix == ".parquet":
+        return pd.read_parquet(save_path)
+    return pd.read_csv(save_path, parse_dates=["timestamp"], dtype=SAVED_DTYPES).astype(TIMESTAMP_DTYPE)
+
+
+# the function computing each time section from the deduplicated original DataFrame
+_SECTIONS = {
+    "hour": _run_hour,
+    "day": _run_day,
+    "week": _run_week,
+    "month": _run_month,
+    "year": _run_year,
+}
 
 
 def generate_df_by_time_section(time_section="hour", save_path=None, verbose=False):
@@ -29,8 +467,13 @@ def generate_df_by_time_section(time_section="hour", save_path=None, verbose=Fal
 
     - save_path : str | pathlib.Path | None = None
 
-        Add a path to a csv file if you want to save the
-        DataFrame.
+        Add a path to a csv file (or a parquet file, with the
+        ".parquet" suffix) if you want to save the
+        DataFrame. The time section is recorded next to it
+        (save_path + ".section"), and if the file already holds the
+        same time section and is more recent than the original csv
+        and this module, it is loaded and returned instead of being
+        computed again. Otherwise it is overwritten.
 
     - verbose: bool = False
 
@@ -44,204 +487,34 @@ def generate_df_by_time_section(time_section="hour", save_path=None, verbose=Fal
     """
 
     assert_err_msg = f"{time_section} is not a valid value for time_section."
-    assert time_section in ["original", "hour", "day", "week", "month", "year"], assert_err_msg
+    assert time_section in ["original", *_SECTIONS], assert_err_msg
 
-    path_original_csv = Path(__file__).resolve().parent.parent / "data" / "energy_use_in_the_UK_original.csv"
-
-    # path = 'https://drive.google.com/uc?export=download&id=14rWJ6OKc_aZbAcb6h220vQP0xfitLgHM'
-    # df_original = pd.read_csv(path, sep=";", parse_dates=[" timestamp"])
-    df_original = pd.read_csv(path_original_csv, parse_dates=["timestamp"])
+    # load the saved csv if it holds this time section and is up to date
+    if save_path and _is_saved(save_path, time_section):
+        print(f"loading the saved file {str(save_path)}") if verbose else ...
+        return _load_saved(save_path)
 
     # remove space from column names
     # df_original = df_original.rename(columns=lambda col: col[1:])
     # return df_original
 
-    # replace ouliers in "solar" values with interpolation
-    print("replace outliers in 'solar' values with interpolation ...") if verbose else ...
-    df_original.loc[576229:576230, "solar"] = [np.nan, np.nan]
-    df_original.loc[:, "solar"] = df_original.loc[:, "solar"].interpolate(method="linear", axis="index")
-
     if time_section == "original":
-        df_result = df_original
+        print("load the original DataFrame ...") if verbose else ...
+        df_result = _fix_solar_outliers(_load_original().copy(), verbose=verbose)
 
     else:
 
-        # drop duplicates
-        df_result = df_original.drop_duplicates().reset_index(drop=True)
-
-        if time_section == "hour":
-
-            # set the timestamps minutes and seconds to 0
-            if verbose:
-                print("set seconds and minutes to 0 ...")
-                df_result["timestamp"] = df_result["timestamp"].progress_map(lambda timestamp: timestamp.replace(second=0, minute=0))
-            else:
-                df_result["timestamp"] = df_result["timestamp"].map(lambda timestamp: timestamp.replace(second=0, minute=0))
-
-            # get the mean values for every hour
-            print("get the mean values for every hour ...") if verbose else ...
-            df_result = df_result.groupby(["timestamp"], as_index=False).mean()
-
-            # add null values to fill missing hours
-
-            # add a column "timestamp_day"
-            if verbose:
-                print("add a column timestamp_day")
-                df_result["timestamp_day"] = df_result["timestamp"].progress_map(lambda timestamp: datetime(timestamp.year, timestamp.month, timestamp.day))
-            else:
-                df_result["timestamp_day"] = df_result["timestamp"].map(lambda timestamp: datetime(timestamp.year, timestamp.month, timestamp.day))
-            # dictionary to store the missing hours
-            missing_hours = {"timestamp": []}
-            # place in "days" the list of all the unique recording days
-            # (no recording day is missing from the first to the last one)
-            days = df_result["timestamp_day"].unique()
-            if verbose:
-                print("look for missing recording hours ...")
-                days = tqdm(days)
-            # for each unique recording day ...
-            for day in days:
-                day = pd.to_datetime(day)
-                # place in df_tmp all recording hours of that day
-                df_tmp = df_result.loc[df_result["timestamp_day"] == day]
-                # if there is less than 24 hours in that day ...
-                if len(df_tmp) != 24:
-                    # for every possible hours ...
-                    for hour in range(24):
-                        # if that hour is missing ...
-                        if not np.any(df_tmp["timestamp"].dt.hour == hour):
-                            # add the missing hour to "missing hours"
-                            missing_hours["timestamp"].append(datetime(day.year, day.month, day.day, hour, 0, 0))
-            # create a DataFrame to hold the missing hours
-            df_missing_hours = pd.DataFrame.from_dict(missing_hours)
-            # add the missing hours to df_result, sort by timestamp and reset the index
-            print("add the missing hours to df_result, sort by timestamp and reset index") if verbose else ...
-            df_result = df_result.append(df_missing_hours).sort_values(by="timestamp").reset_index(drop=True)
-
-            # drop the column "timestamp_day"
-            print("drop the column timestamp_day") if verbose else ...
-            df_result = df_result.drop(columns="timestamp_day")
-
-            # interpolation on the energy columns to fill
-            # the null values of the missing hours
-            print("linear interpolation to fill the missing values ...") if verbose else ...
-            df_result.iloc[:, 1:] = df_result.iloc[:, 1:].interpolate(method="linear", axis="index")
-
-            # multiply by 12 to get the actual values by hour
-            # (the original values were for every 5 minutes)
-            print("multiply all values by 12 to get the actual values by hour ...") if verbose else ...
-            df_result.iloc[:, 1:] = df_result.iloc[:, 1:] * 12
-
-        elif time_section == "day":
-
-            # set the timestamps seconds, minutes and hours to 0
-            if verbose:
-                print("set seconds, minutes and hours to 0 ...")
-                df_result["timestamp"] = df_result["timestamp"].progress_map(lambda timestamp: timestamp.replace(second=0, minute=0, hour=0))
-            else:
-                df_result["timestamp"] = df_result["timestamp"].map(lambda timestamp: timestamp.replace(second=0, minute=0, hour=0))
-
-            # get the mean values of every day
-            print("get the mean values for every day ...") if verbose else ...
-            df_result = df_result.groupby(["timestamp"], as_index=False).mean()
-
-            # multiply by 12 * 24 to get the actual values by day
-            print("multiply all values by 12 * 24 to get the actual values by day ...") if verbose else ...
-            df_result.iloc[:, 1:] = df_result.iloc[:, 1:] * 12 * 24
-
-        elif time_section == "week":
-
-            # set the timestamps seconds, minutes and hours to 0
-            if verbose:
-                print("set the timestamp seconds, minutes and hours to 0 ...")
-                df_result["timestamp"] = df_result["timestamp"].progress_map(lambda timestamp: timestamp.replace(second=0, minute=0, hour=0))
-            else:
-                df_result["timestamp"] = df_result["timestamp"].map(lambda timestamp: timestamp.replace(second=0, minute=0, hour=0))
-
-            # get the mean of every hours for every days
-            print("get the mean of every hours for every days ...") if verbose else ...
-            df_result = df_result.groupby(["timestamp"], as_index=False).mean()
-
-            # add the column "week"
-            print("add a column week") if verbose else ...
-            df_result["week"] = df_result["timestamp"].map(lambda timestamp: timestamp.week)
-
-            # add the column "year"
-            def associate_week_with_year(row):
-                # if it's the 52nd week in january, then it's the 52nd week of the previous year
-                if row["week"] == 52 and row["timestamp"].month == 1:
-                    year = row["timestamp"].year - 1
-                # if it's the 1st week in december, then it's the 1st week of the next year
-                elif row["week"] == 1 and row["timestamp"].month == 12:
-                    year = row["timestamp"].year + 1
-                else:
-                    year = row["timestamp"].year
-                return year
-            if verbose:
-                print("add a column year ...")
-                df_result["year"] = df_result.progress_apply(associate_week_with_year, axis=1)
-            else:
-                df_result["year"] = df_result.apply(associate_week_with_year, axis=1)
-
-            # get the mean of every day for every week
-            print("get the mean of every day for every week ...") if verbose else ...
-            df_tmp_1 = df_result.groupby(by=["year","week"], as_index=False).mean()
-
-            # retrieve the timestamps for the mondays of every week
-            print("retrive the timestamp of the first day of each week ...") if verbose else ...
-            df_tmp_2 = df_result[["year", "week", "timestamp"]].groupby(by=["year", "week"], as_index=False).min()
-
-            # add the timestamps to df_tmp_1
-            df_tmp_1["timestamp"] = df_tmp_2["timestamp"]
-
-            # reorganise the columns
-            df_result = df_tmp_1[["timestamp", "year", "week", "coal", "nuclear", "wind", "hydro", "solar"]]
-
-            # multiply by 12 * 24 * 7 to get the actual values by week
-            print("multiply all values by 12 * 24 * 7 to get the actual values by week ...") if verbose else ...
-            df_result.iloc[:, 3:] = df_result.iloc[:, 3:] * 12 * 24 * 7
-
-        elif time_section == "month":
-
-            # set the timestamps seconds, minutes and hours to 0 and days to 1
-            if verbose:
-                print("set the timestamp seconds, minutes and hours to 0 and days to 1 ...")
-                df_result["timestamp"] = df_result["timestamp"].progress_map(lambda timestamp: timestamp.replace(second=0, minute=0, hour=0, day=1))
-            else:
-                df_result["timestamp"] = df_result["timestamp"].map(lambda timestamp: timestamp.replace(second=0, minute=0, hour=0, day=1))
-
-            # get the mean of every hours for every months
-            print("get the mean of every hour for every month ...") if verbose else ...
-            df_result = df_result.groupby(["timestamp"], as_index=False).mean()
-
-            # multiply by 12 * 24 to get the actual values by day
-            print("multiply all values by 12 * 24 to get the actual values by day ...") if verbose else ...
-            df_result.iloc[:, 1:] = df_result.iloc[:, 1:] * 12 * 24
-
-            print("/!\\ THE DATAFRAME CONTAINS THE MEAN VALUES PER DAY IN THE MONTH /!\\")
-
-        elif time_section == "year":
-
-            # set the timestamps seconds, minutes and hours to 0, days to 1 and months to 1
-            if verbose:
-                print("set the timestamp seconds, minutes and hours to 0, days to 1 and months to 1 ...")
-                df_result["timestamp"] = df_result["timestamp"].progress_map(lambda timestamp: timestamp.replace(second=0, minute=0, hour=0, day=1, month=1))
-            else:
-                df_result["timestamp"] = df_result["timestamp"].map(lambda timestamp: timestamp.replace(second=0, minute=0, hour=0, day=1, month=1))
-
-            # get the mean of every hours for every months
-            print("get the mean of every hour for every year ...") if verbose else ...
-            df_result = df_result.groupby(["timestamp"], as_index=False).mean()
-
-            # multiply by 12 * 24 to get the actual values by day
-            print("multiply all values by 12 * 24 to get the actual values by day ...") if verbose else ...
-            df_result.iloc[:, 1:] = df_result.iloc[:, 1:] * 12 * 24
-
-            print("/!\\ THE DATAFRAME CONTAINS THE MEAN VALUES PER DAY IN THE YEAR /!\\")
+        # the original DataFrame without the solar outliers and duplicates
+        print("load the original DataFrame without outliers and duplicates ...") if verbose else ...
+        df_result = _load_deduplicated().copy()
+
+        # group by the time section
+        df_result = _SECTIONS[time_section](df_result, verbose=verbose)
 
     # save the csv to save_path if provided
     if save_path:
         print(f"saving file to {str(save_path)}") if verbose else ...
-        df_result.to_csv(path_or_buf=save_path, index=False)
+        _save(df_result, save_path, time_section)
 
     print("done") if verbose else ...
 